@@ -4,62 +4,401 @@ Real-time currency exchange rates with GUI
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
-import requests
-from datetime import datetime
-import pandas as pd
+from tkinter import ttk, messagebox, filedialog
+from cachetools import TTLCache
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 import json
+import os
+import threading
+import time
+import uuid
 from pathlib import Path
 
+# requests, pandas and pyarrow are imported where they're used so the window
+# appears without paying for them; Python caches the modules after first use
+
+# orjson is optional; it parses API responses faster than the stdlib
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Currency full names
+_CURRENCY_NAMES = {
+    'EUR': 'Euro (EUR)',
+    'GBP': 'British Pound (GBP)',
+    'JPY': 'Japanese Yen (JPY)',
+    'CHF': 'Swiss Franc (CHF)',
+    'CAD': 'Canadian Dollar (CAD)',
+    'AUD': 'Australian Dollar (AUD)',
+    'CNY': 'Chinese Yuan (CNY)',
+    'TRY': 'Turkish Lira (TRY)',
+    'INR': 'Indian Rupee (INR)',
+    'BRL': 'Brazilian Real (BRL)',
+    'MXN': 'Mexican Peso (MXN)',
+    'ZAR': 'South African Rand (ZAR)'
+}
+
+
+def _format_rate(rate):
+    """Format a rate for display: thousands separators for large values"""
+    return f"{rate:,.2f}" if rate > 100 else f"{rate:.4f}"
+
+
+# Per-user location, so the history doesn't depend on the working directory
+_DEFAULT_HISTORY_PATH = Path.home() / ".currency_tracker" / "history.parquet"
+
+_HISTORY_COLUMNS = ['Base', 'Currency', 'Rate', 'Date', 'Timestamp']
+
+
+def _history_frame(records):
+    """Flatten rate records into one long-format history DataFrame"""
+    import pandas as pd
+    
+    return pd.concat(
+        [
+            pd.DataFrame({
+                'Base': record['base'],
+                'Currency': list(record['rates'].keys()),
+                'Rate': pd.Series(list(record['rates'].values()), dtype='float64'),
+                'Date': record['date'],
+                'Timestamp': record['timestamp']
+            })
+            for record in records
+        ],
+        ignore_index=True
+    )
+
+
+# Rows per worksheet, including the header row
+_EXCEL_MAX_ROWS = 1_048_576
+
+
+def _check_sheet_fits(sheet_name, df):
+    """Raise ValueError if df has more rows than an Excel sheet holds"""
+    # xlsxwriter silently skips rows past the sheet limit (write_row returns -1)
+    if len(df) + 1 > _EXCEL_MAX_ROWS:
+        raise ValueError(
+            f"{sheet_name} has {len(df):,} rows, more than an Excel sheet holds "
+            f"({_EXCEL_MAX_ROWS - 1:,}). Export to Parquet or CSV instead."
+        )
+
+
+def _write_sheet(writer, sheet_name, df):
+    """Write a DataFrame row by row to an xlsxwriter sheet"""
+    _check_sheet_fits(sheet_name, df)
+    # constant_memory only keeps the current row, so cells must be written in
+    # row order - DataFrame.to_excel writes column by column
+    worksheet = writer.book.add_worksheet(sheet_name)
+    worksheet.write_row(0, 0, df.columns)
+    for row_idx, row in enumerate(df.itertuples(index=False, name=None), start=1):
+        worksheet.write_row(row_idx, 0, row)
+
+
+def _write_table(df, path):
+    """Write a DataFrame to Parquet, or CSV for any other extension"""
+    if path.suffix.lower() == '.parquet':
+        df.to_parquet(path, compression='zstd', index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+class TrackerError(Exception):
+    """Base error; the message is only formatted when it is displayed"""
+    
+    def __init__(self, reason, cause=None):
+        super().__init__(reason, cause)
+        self.reason = reason
+        self.cause = cause
+    
+    def __str__(self):
+        return f"{self.reason}: {self.cause}" if self.cause else self.reason
+
+
+class RateFetchError(TrackerError):
+    """Exchange rates could not be fetched or parsed"""
+
+
+class ConversionError(TrackerError):
+    """An amount could not be converted"""
+
 
 class CurrencyTracker:
-    def __init__(self):
+    def __init__(self, history_limit=1000, history_path=_DEFAULT_HISTORY_PATH):
         # Free API - no key required
-        self.api_url = "https://api.frankfurter.app/latest"
+        self.api_root = "https://api.frankfurter.app"
+        self.api_url = f"{self.api_root}/latest"
         self.base_currency = "USD"
-        self.history = []
-        
-    def get_exchange_rates(self, base="USD"):
+        # Bounded so long auto-refresh sessions don't grow memory without limit
+        # (history_limit=None keeps everything)
+        self.history = deque(maxlen=history_limit)
+        # Every snapshot is also appended to a Parquet dataset partitioned by
+        # date, so exports don't re-flatten the whole session
+        self.history_path = Path(history_path) if history_path else None
+        # Saves and export loads both run on worker threads
+        self._history_lock = threading.Lock()
+        # Exports read back only this session's snapshots
+        self.session_start = datetime.now()
+        # Date whose earlier partitions have already been compacted
+        self._compacted_for = None
+        
+        # HTTP session, built on first use (see the session property)
+        self._session = None
+        self._session_lock = threading.Lock()
+        
+        # Frankfurter publishes one rate set per day, so cache per base for an hour.
+        # cachetools caches aren't thread-safe and the GUI uses two workers, so
+        # every cache read and write goes through _cache_lock
+        self._cache_lock = threading.Lock()
+        self._rate_cache = TTLCache(maxsize=8, ttl=3600)
+        # Past dates never change; keep them for a day keyed on (date, base)
+        self._historical_cache = TTLCache(maxsize=32, ttl=86400)
+        # Last ETag and rate table per (endpoint, base) for conditional GETs
+        self._etags = {}
+        
+    @property
+    def session(self):
+        """Shared requests.Session, created on first network call"""
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+                
+                # Reuse keep-alive connections instead of a new TLS handshake per call
+                session = requests.Session()
+                retry = Retry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=[429, 500, 502, 503, 504]
+                )
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry)
+                session.mount("https://", adapter)
+                session.headers.update({
+                    'Accept-Encoding': 'gzip, deflate',
+                    'User-Agent': 'currency-tracker/1.0'
+                })
+                self._session = session
+            return self._session
+    
+    def get_exchange_rates(self, base="USD", force_refresh=False):
         """Get current exchange rates for a base currency"""
+        if not force_refresh:
+            with self._cache_lock:
+                cached = self._rate_cache.get(base)
+            if cached is not None:
+                return cached, None
+        
+        rates, error = self._request_rates(self.api_url, base)
+        if rates:
+            with self._cache_lock:
+                self._rate_cache[base] = rates
+        return rates, error
+    
+    def get_historical(self, date_iso, base="USD"):
+        """Get exchange rates published on a given date (YYYY-MM-DD)"""
+        key = (date_iso, base)
+        with self._cache_lock:
+            cached = self._historical_cache.get(key)
+        if cached is not None:
+            return cached, None
+        
+        rates, error = self._request_rates(f"{self.api_root}/{date_iso}", base)
+        if rates:
+            with self._cache_lock:
+                self._historical_cache[key] = rates
+        return rates, error
+    
+    def _request_rates(self, url, base):
+        """Fetch a rate table from a Frankfurter endpoint"""
+        import requests
+        
+        key = (url, base)
+        validated = self._etags.get(key)
+        headers = {'If-None-Match': validated[0]} if validated else None
+        
         try:
             params = {"from": base}
-            response = requests.get(self.api_url, params=params, timeout=10)
-            response.raise_for_status()
+            response = self.session.get(url, params=params, headers=headers, timeout=10)
+            if response.status_code == 304 and validated:
+                # Unchanged since the last fetch - hand back the same table so
+                # history doesn't record the revalidation as a new snapshot
+                return validated[1], None
             
-            data = response.json()
+            # Skip body parsing entirely on errors
+            if response.status_code != 200:
+                return None, RateFetchError("Network error", f"HTTP {response.status_code} from {url}")
+            
+            # Parse the (already decompressed) bytes directly - no text decode
+            data = _json_loads(response.content)
             
             rates = {
                 'base': data['base'],
                 'date': data['date'],
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'timestamp': datetime.now(),
                 'rates': data['rates']
             }
             
+            etag = response.headers.get('ETag')
+            if etag:
+                self._etags[key] = (etag, rates)
+            
             return rates, None
             
         except requests.exceptions.RequestException as e:
-            return None, f"Network error: {str(e)}"
-        except Exception as e:
-            return None, f"Error: {str(e)}"
+            return None, RateFetchError("Network error", e)
+        except (KeyError, ValueError) as e:
+            # ValueError covers both json and orjson decode errors
+            return None, RateFetchError("Unexpected API response", e)
     
-    def get_conversion(self, amount, from_currency, to_currency):
+    def get_conversion(self, amount, from_currency, to_currency, rates_dict=None):
         """Convert amount from one currency to another"""
+        # Prefer a rate table we already hold: the source currency's own, the
+        # caller's, or the default USD table, triangulating through its base
         try:
-            url = f"https://api.frankfurter.app/latest?amount={amount}&from={from_currency}&to={to_currency}"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+            with self._cache_lock:
+                candidates = (self._rate_cache.get(from_currency), rates_dict,
+                              self._rate_cache.get(self.base_currency))
             
-            data = response.json()
-            converted_amount = data['rates'][to_currency]
+            for rates_data in candidates:
+                if rates_data is not None:
+                    converted_amount = self._triangulate(amount, from_currency,
+                                                         to_currency, rates_data)
+                    if converted_amount is not None:
+                        return converted_amount, None
+            
+            # Neither currency is in a cached payload - one /latest query for the
+            # source table seeds the cache for every later pair from it
+            rates_data, error = self.get_exchange_rates(from_currency)
+            if error:
+                return None, ConversionError("Conversion error", error)
+            
+            converted_amount = self._triangulate(amount, from_currency,
+                                                 to_currency, rates_data)
+            if converted_amount is None:
+                return None, ConversionError(f"No rate for {from_currency} -> {to_currency}")
             
             return converted_amount, None
             
-        except Exception as e:
-            return None, f"Conversion error: {str(e)}"
+        except (KeyError, ValueError, ZeroDivisionError) as e:
+            return None, ConversionError("Conversion error", e)
+    
+    @staticmethod
+    def _triangulate(amount, from_currency, to_currency, rates_data):
+        """Convert through a rate table's base; None if a currency is missing"""
+        base = rates_data['base']
+        rates = rates_data['rates']
+        from_rate = 1.0 if from_currency == base else rates.get(from_currency)
+        to_rate = 1.0 if to_currency == base else rates.get(to_currency)
+        if from_rate is None or to_rate is None:
+            return None
+        return amount * to_rate / from_rate
     
     def save_to_history(self, rates_data):
         """Save current rates to history"""
-        self.history.append(rates_data)
+        with self._history_lock:
+            # A cache hit or an unchanged table isn't a new snapshot
+            if self.history:
+                last = self.history[-1]
+                if last is rates_data or (
+                    last['base'] == rates_data['base']
+                    and last['date'] == rates_data['date']
+                    and last['rates'] == rates_data['rates']
+                ):
+                    return
+            self.history.append(rates_data)
+            
+            if self.history_path:
+                self._write_history_file(rates_data)
+    
+    def _write_history_file(self, rates_data):
+        """Append one record to the dataset as a new Date=... partition file"""
+        import pyarrow as pa
+        
+        # Date lives in the directory name, like pq.write_to_dataset would do
+        df = _history_frame([rates_data]).drop(columns='Date')
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        
+        partition = self.history_path / f"Date={rates_data['date']}"
+        partition.mkdir(parents=True, exist_ok=True)
+        try:
+            self._write_parquet_atomic(table, partition / f"{uuid.uuid4().hex}.parquet")
+        finally:
+            # An empty partition reads back as a table with no columns
+            if not any(partition.iterdir()):
+                partition.rmdir()
+        
+        # Once a new date starts, earlier days are complete: merge each into
+        # one file so the dataset grows by a file per day, not per snapshot
+        if self._compacted_for != rates_data['date']:
+            self._compact_partitions(rates_data['date'])
+            self._compacted_for = rates_data['date']
+    
+    @staticmethod
+    def _write_parquet_atomic(table, path):
+        """Write a Parquet file via a dot-file and rename it into place"""
+        import pyarrow.parquet as pq
+        
+        # Dot-files are ignored by dataset reads, so a killed process never
+        # leaves a truncated file in the dataset
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        try:
+            pq.write_table(table, tmp_path, compression='zstd')
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+    
+    def _compact_partitions(self, current_date):
+        """Merge the snapshot files of every finished day into a single file"""
+        import pyarrow.parquet as pq
+        
+        for partition in self.history_path.glob("Date=*"):
+            if partition.name == f"Date={current_date}":
+                continue
+            # Temp files left by a killed process, and partitions they leave empty
+            for stale in partition.glob(".*.tmp"):
+                stale.unlink()
+            files = sorted(partition.glob("*.parquet"))
+            if not files and not any(partition.iterdir()):
+                partition.rmdir()
+            if len(files) < 2:
+                continue
+            table = pq.read_table(partition, partitioning=None)
+            # Replace the first file with the merged table, then drop the rest
+            self._write_parquet_atomic(table, files[0])
+            for path in files[1:]:
+                path.unlink()
+    
+    def load_history(self, since=None):
+        """Load saved rate history as a DataFrame (None if there is none)"""
+        with self._history_lock:
+            if self.history_path and self.history_path.exists():
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                
+                # Row-group statistics let Arrow skip older files' data
+                filters = [('Timestamp', '>=', since)] if since else None
+                try:
+                    df = pq.read_table(self.history_path, filters=filters).to_pandas()
+                except (OSError, pa.ArrowException):
+                    # Unreadable dataset - fall back to this session's records
+                    df = None
+                # A partition with no data files yields a frame without columns
+                if df is not None and not set(_HISTORY_COLUMNS).issubset(df.columns):
+                    df = None
+                if df is not None:
+                    # Date comes back from the partition directories as a category
+                    df['Date'] = df['Date'].astype(str)
+                    return df[_HISTORY_COLUMNS].sort_values('Timestamp', kind='stable', ignore_index=True)
+            records = [r for r in self.history if since is None or r['timestamp'] >= since]
+            if records:
+                return _history_frame(records)
+            return None
 
 
 class CurrencyTrackerGUI:
@@ -73,10 +412,37 @@ class CurrencyTrackerGUI:
         self.current_rates = None
         self.auto_refresh = False
         self.refresh_job = None
+        # Auto-refresh runs against absolute monotonic deadlines so it doesn't drift
+        self.refresh_interval = 60  # seconds
+        self._next_refresh_at = None
+        
+        # Network calls run off the Tk main thread; results come back via root.after
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        # Every submitted job, so closing the window can cancel queued ones
+        self._pending = set()
+        self._refresh_future = None
+        self._convert_future = None
+        self._closing = False
+        
+        # In-flight guard and debounce handle for overlapping refreshes
+        self._refresh_inflight = False
+        self._refresh_queued = False
+        self._refresh_pending_after = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Popular currencies to display
-        self.display_currencies = ['EUR', 'GBP', 'JPY', 'CHF', 'CAD', 'AUD', 
-                                   'CNY', 'TRY', 'INR', 'BRL', 'MXN', 'ZAR']
+        self.display_currencies = ('EUR', 'GBP', 'JPY', 'CHF', 'CAD', 'AUD', 
+                                   'CNY', 'TRY', 'INR', 'BRL', 'MXN', 'ZAR')
+        # Fixed for the app's lifetime, so resolve display names once
+        self._display_pairs = tuple(
+            (currency, _CURRENCY_NAMES.get(currency, currency))
+            for currency in self.display_currencies
+        )
+        
+        # Style the treeview (ttk styles are global, so configure once)
+        style = ttk.Style()
+        style.configure("Treeview", rowheight=35, font=('Arial', 10))
+        style.configure("Treeview.Heading", font=('Arial', 10, 'bold'))
         
         self.create_widgets()
         
@@ -123,12 +489,13 @@ class CurrencyTrackerGUI:
             font=('Arial', 10)
         )
         base_combo.pack(side='left', padx=(0, 20))
+        base_combo.bind('<<ComboboxSelected>>', self._on_base_selected)
         
         # Refresh button
         self.refresh_btn = tk.Button(
             control_frame,
             text="🔄 Refresh Rates",
-            command=self.refresh_rates,
+            command=lambda: self.refresh_rates(force_refresh=True),
             font=('Arial', 10, 'bold'),
             bg='#2563eb',
             fg='white',
@@ -143,7 +510,7 @@ class CurrencyTrackerGUI:
         self.auto_refresh_var = tk.BooleanVar(value=False)
         auto_refresh_cb = tk.Checkbutton(
             control_frame,
-            text="Auto-refresh (60s)",
+            text=f"Auto-refresh ({self.refresh_interval}s)",
             variable=self.auto_refresh_var,
             command=self.toggle_auto_refresh,
             font=('Arial', 9),
@@ -155,8 +522,8 @@ class CurrencyTrackerGUI:
         # Export button
         self.export_btn = tk.Button(
             control_frame,
-            text="💾 Export to Excel",
-            command=self.export_to_excel,
+            text="💾 Export",
+            command=self.export_data,
             font=('Arial', 10, 'bold'),
             bg='#16a34a',
             fg='white',
@@ -222,6 +589,14 @@ class CurrencyTrackerGUI:
         self.rates_tree.column('Rate', width=250, anchor='center')
         self.rates_tree.column('Change', width=200, anchor='center')
         
+        # Colour the 24h change
+        self.rates_tree.tag_configure('up', foreground='#16a34a')
+        self.rates_tree.tag_configure('down', foreground='#dc2626')
+        
+        # One fixed row per display currency; refreshes only rewrite the values
+        for currency, name in self._display_pairs:
+            self.rates_tree.insert('', 'end', iid=currency, values=(name, '—', '—'))
+        
         # Add scrollbar
         scrollbar = ttk.Scrollbar(rates_frame, orient='vertical', command=self.rates_tree.yview)
         self.rates_tree.configure(yscrollcommand=scrollbar.set)
@@ -230,11 +605,6 @@ class CurrencyTrackerGUI:
         self.rates_tree.pack(side='left', fill='both', expand=True, padx=10, pady=10)
         scrollbar.pack(side='right', fill='y', pady=10)
         
-        # Style the treeview
-        style = ttk.Style()
-        style.configure("Treeview", rowheight=35, font=('Arial', 10))
-        style.configure("Treeview.Heading", font=('Arial', 10, 'bold'))
-        
         # Converter section
         converter_frame = tk.LabelFrame(
             main_frame,
@@ -295,7 +665,7 @@ class CurrencyTrackerGUI:
         to_combo = ttk.Combobox(
             converter_inner,
             textvariable=self.to_currency_var,
-            values=self.display_currencies + base_currencies,
+            values=list(self.display_currencies) + base_currencies,
             state='readonly',
             width=10,
             font=('Arial', 10)
@@ -327,106 +697,176 @@ class CurrencyTrackerGUI:
         )
         self.convert_result_label.pack(pady=(0, 15))
         
-    def refresh_rates(self):
+    def refresh_rates(self, force_refresh=False):
         """Refresh exchange rates"""
+        if self._refresh_inflight:
+            # Coalesce with the fetch in flight; run once more when it lands
+            self._refresh_queued = True
+            return
+        self._refresh_inflight = True
+        
         self.refresh_btn.config(state='disabled')
         self.status_label.config(text="Fetching exchange rates...", fg='#0c4a6e')
-        self.root.update_idletasks()
         
         base = self.base_currency_var.get()
-        rates_data, error = self.tracker.get_exchange_rates(base)
+        self._refresh_future = self._submit(
+            self._fetch_rates, base, force_refresh
+        )
+        self._refresh_future.add_done_callback(
+            lambda f: self._on_done(
+                f, self._apply_rates,
+                lambda e: (None, RateFetchError("Unexpected error", e), None)
+            )
+        )
+    
+    def _submit(self, fn, *args):
+        """Run fn on the worker pool, tracking the future until it finishes"""
+        future = self._executor.submit(fn, *args)
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        return future
+    
+    def _fetch_rates(self, base, force_refresh):
+        """Fetch latest and previous-day rates (runs on a worker thread)"""
+        rates_data, error = self.tracker.get_exchange_rates(base, force_refresh)
+        if error:
+            return None, error, None
+        
+        # Best effort: without the previous day the change column shows N/A.
+        # Frankfurter answers weekends/holidays with the last published day.
+        previous_day = date.fromisoformat(rates_data['date']) - timedelta(days=1)
+        previous_rates, _ = self.tracker.get_historical(previous_day.isoformat(), base)
+        return rates_data, None, previous_rates
+    
+    def _on_base_selected(self, event=None):
+        """Debounce base currency changes so rapid toggles refresh once"""
+        if self._refresh_pending_after:
+            self.root.after_cancel(self._refresh_pending_after)
+        self._refresh_pending_after = self.root.after(250, self._do_refresh)
+    
+    def _do_refresh(self):
+        """Run the debounced refresh"""
+        self._refresh_pending_after = None
+        self.refresh_rates()
+    
+    def _on_done(self, future, callback, on_error, *args):
+        """Hand a finished worker result back to the Tk main thread"""
+        if self._closing or future.cancelled():
+            return
+        # An exception raised in the worker still has to reach the callback,
+        # otherwise the in-flight flag and disabled button are never reset
+        exc = future.exception()
+        result = on_error(exc) if exc is not None else future.result()
+        self.root.after(0, callback, *args, *result)
+    
+    def _apply_rates(self, rates_data, error, previous_rates):
+        """Apply fetched rates to the widgets (runs on the Tk main thread)"""
+        self._refresh_future = None
+        self._refresh_inflight = False
+        if self._refresh_queued:
+            # A refresh was requested mid-flight (e.g. base changed); run it next
+            self._refresh_queued = False
+            self.root.after(0, self.refresh_rates)
         
         if error:
             self.status_label.config(text=f"Error: {error}", fg='#dc2626')
-            messagebox.showerror("Error", error)
+            messagebox.showerror("Error", str(error))
             self.refresh_btn.config(state='normal')
             return
         
         self.current_rates = rates_data
-        self.tracker.save_to_history(rates_data)
+        # Persisting to Parquet does disk I/O, so keep it off the Tk thread
+        save_future = self._submit(self.tracker.save_to_history, rates_data)
+        save_future.add_done_callback(self._on_history_saved)
         
         # Update display
-        self.update_rates_display(rates_data)
+        self.update_rates_display(rates_data, previous_rates)
         
         # Update status
         self.status_label.config(
             text=f"✓ Rates updated successfully | Base: {rates_data['base']} | Date: {rates_data['date']}",
             fg='#16a34a'
         )
-        self.update_time_label.config(text=f"Last updated: {rates_data['timestamp']}")
+        self.update_time_label.config(text=f"Last updated: {rates_data['timestamp'].isoformat(sep=' ', timespec='seconds')}")
         
         self.export_btn.config(state='normal')
         self.refresh_btn.config(state='normal')
         
-    def update_rates_display(self, rates_data):
+    def _on_history_saved(self, future):
+        """Surface a failed history save in the status bar"""
+        if self._closing or future.cancelled() or future.exception() is None:
+            return
+        self.root.after(0, lambda e=future.exception(): self.status_label.config(
+            text=f"Error: could not save history: {e}", fg='#dc2626'
+        ))
+    
+    def update_rates_display(self, rates_data, previous_rates=None):
         """Update the treeview with current rates"""
-        # Clear existing items
-        for item in self.rates_tree.get_children():
-            self.rates_tree.delete(item)
-        
-        # Add new rates
         rates = rates_data['rates']
+        previous = previous_rates['rates'] if previous_rates else {}
         
-        # Currency full names
-        currency_names = {
-            'EUR': 'Euro (EUR)',
-            'GBP': 'British Pound (GBP)',
-            'JPY': 'Japanese Yen (JPY)',
-            'CHF': 'Swiss Franc (CHF)',
-            'CAD': 'Canadian Dollar (CAD)',
-            'AUD': 'Australian Dollar (AUD)',
-            'CNY': 'Chinese Yuan (CNY)',
-            'TRY': 'Turkish Lira (TRY)',
-            'INR': 'Indian Rupee (INR)',
-            'BRL': 'Brazilian Real (BRL)',
-            'MXN': 'Mexican Peso (MXN)',
-            'ZAR': 'South African Rand (ZAR)'
-        }
-        
-        for currency in self.display_currencies:
-            if currency in rates:
-                rate = rates[currency]
-                name = currency_names.get(currency, currency)
-                
-                # Format rate
-                if rate > 100:
-                    rate_str = f"{rate:,.2f}"
-                else:
-                    rate_str = f"{rate:.4f}"
-                
-                # Calculate change (simplified - would need historical data for real change)
-                change = "N/A"
-                
-                self.rates_tree.insert('', 'end', values=(name, rate_str, change))
+        for currency, name in self._display_pairs:
+            rate = rates.get(currency)
+            
+            # The base currency itself isn't in the payload
+            if rate is None:
+                self.rates_tree.item(currency, values=(name, '—', '—'), tags=())
+                continue
+            
+            # Percentage change against the previous published day
+            previous_rate = previous.get(currency)
+            if not previous_rate:
+                change, tags = "N/A", ()
+            else:
+                pct = (rate - previous_rate) / previous_rate * 100
+                tags = ('up',) if pct > 0 else ('down',) if pct < 0 else ()
+                change = f"{pct:+.2f}%"
+            
+            self.rates_tree.item(currency, values=(name, _format_rate(rate), change), tags=tags)
     
     def convert_currency(self):
         """Convert currency based on user input"""
         try:
             amount = float(self.amount_entry.get())
-            from_curr = self.from_currency_var.get()
-            to_curr = self.to_currency_var.get()
-            
-            if from_curr == to_curr:
-                messagebox.showwarning("Warning", "Please select different currencies")
-                return
-            
-            result, error = self.tracker.get_conversion(amount, from_curr, to_curr)
-            
-            if error:
-                messagebox.showerror("Error", error)
-                return
-            
-            self.convert_result_label.config(
-                text=f"{amount:,.2f} {from_curr} = {result:,.2f} {to_curr}"
-            )
-            
         except ValueError:
             messagebox.showerror("Error", "Please enter a valid amount")
+            return
+        
+        from_curr = self.from_currency_var.get()
+        to_curr = self.to_currency_var.get()
+        
+        if from_curr == to_curr:
+            messagebox.showwarning("Warning", "Please select different currencies")
+            return
+        
+        self._convert_future = self._submit(
+            self.tracker.get_conversion, amount, from_curr, to_curr, self.current_rates
+        )
+        self._convert_future.add_done_callback(
+            lambda f: self._on_done(
+                f, self._apply_conversion,
+                lambda e: (None, ConversionError("Unexpected error", e)),
+                amount, from_curr, to_curr
+            )
+        )
+    
+    def _apply_conversion(self, amount, from_curr, to_curr, result, error):
+        """Show a conversion result (runs on the Tk main thread)"""
+        self._convert_future = None
+        
+        if error:
+            messagebox.showerror("Error", str(error))
+            return
+        
+        self.convert_result_label.config(
+            text=f"{amount:,.2f} {from_curr} = {result:,.2f} {to_curr}"
+        )
     
     def toggle_auto_refresh(self):
         """Toggle auto-refresh functionality"""
         if self.auto_refresh_var.get():
             self.auto_refresh = True
+            self._next_refresh_at = time.monotonic()
             self.schedule_refresh()
         else:
             self.auto_refresh = False
@@ -436,63 +876,123 @@ class CurrencyTrackerGUI:
     
     def schedule_refresh(self):
         """Schedule next refresh"""
-        if self.auto_refresh:
+        if not self.auto_refresh:
+            return
+        
+        # Skip this cycle rather than queue behind a fetch that's still running.
+        # Only the Refresh button bypasses the cache; auto-refresh reaches the
+        # network once the TTL expires
+        if not self._refresh_inflight:
             self.refresh_rates()
-            # Schedule next refresh in 60 seconds
-            self.refresh_job = self.root.after(60000, self.schedule_refresh)
+        
+        self._next_refresh_at += self.refresh_interval
+        now = time.monotonic()
+        if self._next_refresh_at <= now:
+            # Fell behind (e.g. system sleep) - restart the cadence from now
+            self._next_refresh_at = now + self.refresh_interval
+        delay_ms = max(0, int((self._next_refresh_at - now) * 1000))
+        self.refresh_job = self.root.after(delay_ms, self.schedule_refresh)
     
-    def export_to_excel(self):
-        """Export current rates and history to Excel"""
+    def export_data(self):
+        """Export current rates and history to Parquet, CSV or Excel"""
         if not self.current_rates:
             messagebox.showwarning("No Data", "No rates to export!")
             return
         
-        try:
-            # Prepare current rates data
-            rates_list = []
-            base = self.current_rates['base']
-            
-            for currency, rate in self.current_rates['rates'].items():
-                rates_list.append({
-                    'Base Currency': base,
-                    'Target Currency': currency,
-                    'Exchange Rate': rate,
-                    'Date': self.current_rates['date'],
-                    'Timestamp': self.current_rates['timestamp']
-                })
-            
-            df_current = pd.DataFrame(rates_list)
-            
-            # Generate filename
-            filename = f"exchange_rates_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            
-            # Create Excel writer
-            with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                df_current.to_excel(writer, sheet_name='Current Rates', index=False)
-                
-                # If history exists, add it
-                if self.tracker.history:
-                    history_list = []
-                    for record in self.tracker.history:
-                        for currency, rate in record['rates'].items():
-                            history_list.append({
-                                'Base': record['base'],
-                                'Currency': currency,
-                                'Rate': rate,
-                                'Date': record['date'],
-                                'Timestamp': record['timestamp']
-                            })
-                    
-                    df_history = pd.DataFrame(history_list)
-                    df_history.to_excel(writer, sheet_name='History', index=False)
-            
-            messagebox.showinfo(
-                "Success",
-                f"Exported exchange rates to:\n{filename}"
-            )
+        filename = filedialog.asksaveasfilename(
+            title="Export Exchange Rates",
+            initialfile=f"exchange_rates_{datetime.now():%Y%m%d_%H%M%S}",
+            defaultextension='.parquet',
+            filetypes=[('Parquet', '*.parquet'), ('CSV', '*.csv'), ('Excel', '*.xlsx')]
+        )
+        if not filename:
+            return
+        
+        self.export_btn.config(state='disabled')
+        self.status_label.config(text="Exporting...", fg='#0c4a6e')
+        # Reading history and serializing can take a while; keep it off Tk
+        export_future = self._submit(self._export_files, Path(filename), self.current_rates)
+        export_future.add_done_callback(
+            lambda f: self._on_done(f, self._apply_export, lambda e: (None, e))
+        )
+    
+    def _export_files(self, path, current_rates):
+        """Write the export file(s) (runs on a worker thread)"""
+        import pandas as pd
+        
+        # Prepare current rates data (scalar columns broadcast)
+        rates = current_rates['rates']
+        df_current = pd.DataFrame({
+            'Base Currency': current_rates['base'],
+            'Target Currency': list(rates.keys()),
+            'Exchange Rate': list(rates.values()),
+            'Date': current_rates['date'],
+            'Timestamp': current_rates['timestamp']
+        })
+        
+        # If history exists, add this session's part of it
+        df_history = self.tracker.load_history(since=self.tracker.session_start)
+        
+        if path.suffix.lower() == '.xlsx':
+            # Check before creating the file so an oversized export isn't left half-written
+            _check_sheet_fits('Current Rates', df_current)
+            if df_history is not None:
+                _check_sheet_fits('History', df_history)
             
-        except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export:\n{str(e)}")
+            # Create Excel writer; constant_memory streams each row to disk
+            with pd.ExcelWriter(
+                path,
+                engine='xlsxwriter',
+                engine_kwargs={'options': {
+                    'constant_memory': True,
+                    'default_date_format': 'yyyy-mm-dd hh:mm:ss'
+                }}
+            ) as writer:
+                _write_sheet(writer, 'Current Rates', df_current)
+                if df_history is not None:
+                    _write_sheet(writer, 'History', df_history)
+            exported = [path]
+        else:
+            # Flat formats hold one table, so history goes to a sibling file
+            _write_table(df_current, path)
+            exported = [path]
+            if df_history is not None:
+                history_path = path.with_name(f"{path.stem}_history{path.suffix}")
+                _write_table(df_history, history_path)
+                exported.append(history_path)
+        
+        return exported, None
+    
+    def _apply_export(self, exported, error):
+        """Report the export result (runs on the Tk main thread)"""
+        self.export_btn.config(state='normal')
+        
+        if error:
+            self.status_label.config(text="Error: export failed", fg='#dc2626')
+            messagebox.showerror("Export Error", f"Failed to export:\n{error}")
+            return
+        
+        self.status_label.config(text="✓ Export complete", fg='#16a34a')
+        messagebox.showinfo(
+            "Success",
+            "Exported exchange rates to:\n" + "\n".join(str(p) for p in exported)
+        )
+    
+    def on_close(self):
+        """Cancel pending work and close the window"""
+        self._closing = True
+        for job in (self.refresh_job, self._refresh_pending_after):
+            if job:
+                self.root.after_cancel(job)
+        self.refresh_job = None
+        self._refresh_pending_after = None
+        # Drop queued jobs (fetches, history saves). Jobs already running can't
+        # be interrupted: a request blocked in session.get finishes or times
+        # out (10s per attempt, with retries) before the process can exit.
+        for future in list(self._pending):
+            future.cancel()
+        self._executor.shutdown(wait=False)
+        self.root.destroy()
 
 
 def main():